@@ -4,93 +4,277 @@ Debug script to inspect Blocket HTML structure
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import sys
+from lxml import etree
+from lxml.etree import XPath
+from cssselect import HTMLTranslator, parse as parse_css
+from cssselect.parser import Attrib, Class, Element
 import re
 
+# Common selectors to try
+SELECTORS = [
+    '.item-price',
+    '.search-item__price', 
+    '.price-container',
+    '[data-testid="price"]',
+    '.amount',
+    '.price',
+    '.listing-price',
+    '.ad-price',
+    '[class*="price"]',
+    '[class*="Price"]'
+]
+
+_TRANSLATOR = HTMLTranslator()
+
+def compile_matcher(selector):
+    """
+    Compile a selector into a test on a single element
+    
+    Returns a class name for plain class selectors, which are looked up
+    against the element's class tokens, and a predicate otherwise. Attribute
+    selectors become direct attribute checks, much cheaper per element than
+    an XPath call; anything else falls back to an XPath test on the element.
+    """
+    tree = parse_css(selector)[0].parsed_tree
+    if isinstance(getattr(tree, 'selector', None), Element) and tree.selector.element is None:
+        if isinstance(tree, Class):
+            return tree.class_name
+        if isinstance(tree, Attrib) and tree.namespace is None and tree.operator in ('=', '*='):
+            name, value = tree.attrib, tree.value.value
+            if tree.operator == '=':
+                return lambda elem: elem.get(name) == value
+            return lambda elem: value in (elem.get(name) or '')
+    xpath_fn = XPath(_TRANSLATOR.css_to_xpath(selector, prefix='self::'))
+    return lambda elem: bool(xpath_fn(elem))
+
+# Selectors compiled once at import, so they can be matched while the page is streamed
+CLASS_SELECTORS = {}
+PREDICATE_SELECTORS = []
+for _selector in SELECTORS:
+    _matcher = compile_matcher(_selector)
+    if isinstance(_matcher, str):
+        CLASS_SELECTORS[_matcher] = _selector
+    else:
+        PREDICATE_SELECTORS.append((_selector, _matcher))
+SAMPLES_PER_SELECTOR = 3
+
+# Price patterns, the kr scan runs on the raw response bytes. The pattern
+# starts on a digit so the engine does not try a context prefix at every
+# offset; context is sliced around each match afterwards.
+_KR_PRICE_RE = re.compile(rb'\d[\d.\s,]*kr', re.IGNORECASE)
+_KR_CONTEXT_BYTES = 20
+_KR_SAMPLES = 10
+# Bytes kept between chunks so a price split across two chunks is still found
+_KR_CARRY_BYTES = 4096
+_CHUNK_SIZE = 65536
+_KR_INLINE_RE = re.compile(r'\d+.*kr', re.IGNORECASE)
+
+# One keep-alive session so repeated fetches reuse the connection
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate, br'
+})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1,
+                                       max_retries=Retry(total=3, backoff_factor=0.3)))
+
+# Text nodes BeautifulSoup's get_text() would return for an element
+_ELEMENT_TEXT = XPath(
+    'descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]'
+)
+
+def own_text(elem):
+    """Text directly inside an element, excluding text of nested elements"""
+    return (elem.text or '') + ''.join(child.tail or '' for child in elem)
+
+class PageScanner:
+    """
+    Collects selector hits, price candidates and page stats in one pass
+    
+    Fed with start/end parser events. Finished elements are cleared unless
+    an enclosing selector match still needs its subtree for sample text.
+    """
+    
+    def __init__(self):
+        self.title = None
+        self.scripts = 0
+        self.selector_counts = {selector: 0 for selector in SELECTORS}
+        self.selector_samples = {selector: [] for selector in SELECTORS}
+        self.price_candidates = []
+        self._sample_slots = {}
+        self._open_samples = 0
+    
+    def start(self, elem):
+        if not elem.attrib:
+            return
+        hits = {CLASS_SELECTORS[name] for name in (elem.get('class') or '').split()
+                if name in CLASS_SELECTORS}
+        hits.update(selector for selector, matches in PREDICATE_SELECTORS if matches(elem))
+        
+        slots = []
+        for selector in hits:
+            self.selector_counts[selector] += 1
+            samples = self.selector_samples[selector]
+            if len(samples) < SAMPLES_PER_SELECTOR:
+                # Reserve the slot now so samples stay in document order
+                slots.append((selector, len(samples)))
+                samples.append(None)
+        if slots:
+            self._sample_slots[elem] = slots
+            self._open_samples += 1
+    
+    def end(self, elem):
+        slots = self._sample_slots.pop(elem, None)
+        if slots:
+            text = ''.join(text.strip() for text in _ELEMENT_TEXT(elem))
+            for selector, slot in slots:
+                self.selector_samples[selector][slot] = text
+            self._open_samples -= 1
+        
+        if elem.tag in ('div', 'span'):
+            text = own_text(elem).strip()
+            if _KR_INLINE_RE.search(text):
+                self.price_candidates.append((elem.get('class', '').split(), text))
+        elif elem.tag == 'title' and self.title is None:
+            self.title = elem.text
+        elif elem.tag == 'script':
+            self.scripts += 1
+        
+        if not self._open_samples:
+            # Keep the tail, it is part of the parent's own text
+            elem.clear(keep_tail=True)
+            # Drop the cleared siblings before it too, so the parent does not
+            # keep one empty element per child; their tails move into the
+            # parent's text to keep its own text intact
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    parent.text = (parent.text or '') + (parent[0].tail or '')
+                    del parent[0]
+
+class KrScanner:
+    """
+    Finds 'kr' price patterns in a byte stream fed chunk by chunk
+    
+    Only a short tail of the previous chunk is kept, so the raw page never
+    has to be held in memory as a whole.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.samples = []
+        self._buffer = b''
+        self._base = 0  # Stream offset of self._buffer[0]
+        self._resume = 0  # Stream offset where the next match may start
+    
+    def feed(self, chunk, final=False):
+        buffer = self._buffer + chunk
+        # A match needs its trailing context in the buffer, otherwise it may
+        # still grow with the next chunk
+        limit = len(buffer) if final else len(buffer) - _KR_CONTEXT_BYTES
+        
+        for match in _KR_PRICE_RE.finditer(buffer, max(0, self._resume - self._base)):
+            start, end = match.span()
+            if end > limit:
+                break
+            self.count += 1
+            if len(self.samples) < _KR_SAMPLES:
+                before = buffer[max(0, start - _KR_CONTEXT_BYTES):start].rsplit(b'\n', 1)[-1]
+                after = buffer[end:end + _KR_CONTEXT_BYTES].split(b'\n', 1)[0]
+                self.samples.append((before + buffer[start:end] + after).decode('utf-8', 'replace').strip())
+            self._resume = self._base + end
+        
+        # Nothing before the resume offset can start a new match, and nothing
+        # before the carry window can belong to an unfinished one; the context
+        # before the next match is kept as well
+        keep_from = max(self._resume - self._base, len(buffer) - _KR_CARRY_BYTES)
+        keep_from = max(0, keep_from - _KR_CONTEXT_BYTES)
+        self._buffer = buffer[keep_from:]
+        self._base += keep_from
+
 def debug_blocket_page():
     url = "https://www.blocket.se/annonser/hela_sverige?q=7800x3d"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    print(f"🔍 Fetching: {url}")
+    # Report lines are buffered and written in one go at the end
+    out = []
+    out.append(f"🔍 Fetching: {url}")
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        scanner = PageScanner()
+        kr_scanner = KrScanner()
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        content_length = 0
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        def handle_events():
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    scanner.start(elem)
+                else:
+                    scanner.end(elem)
         
-        print(f"✅ Page loaded successfully")
-        print(f"📄 Title: {soup.title.string if soup.title else 'No title'}")
-        print(f"📏 Content length: {len(response.content)} bytes")
+        # Parse while downloading, so neither the raw page nor the full
+        # tree is held in memory at once
+        with _SESSION.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                content_length += len(chunk)
+                parser.feed(chunk)
+                kr_scanner.feed(chunk)
+                handle_events()
+        parser.close()
+        kr_scanner.feed(b'', final=True)
+        handle_events()
         
-        # Look for common price-related elements
-        print("\n🔎 Searching for price-related elements...")
+        out.append(f"✅ Page loaded successfully")
+        out.append(f"📄 Title: {scanner.title if scanner.title else 'No title'}")
+        out.append(f"📏 Content length: {content_length} bytes")
         
-        # Common selectors to try
-        selectors = [
-            '.item-price',
-            '.search-item__price', 
-            '.price-container',
-            '[data-testid="price"]',
-            '.amount',
-            '.price',
-            '.listing-price',
-            '.ad-price',
-            '[class*="price"]',
-            '[class*="Price"]'
-        ]
+        # Look for common price-related elements
+        out.append("\n🔎 Searching for price-related elements...")
         
         found_elements = False
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"  ✅ Found {len(elements)} elements with selector: {selector}")
-                for i, elem in enumerate(elements[:3]):  # Show first 3
-                    print(f"    {i+1}: {elem.get_text(strip=True)}")
+        for selector in SELECTORS:
+            count = scanner.selector_counts[selector]
+            if count:
+                out.append(f"  ✅ Found {count} elements with selector: {selector}")
+                for i, text in enumerate(scanner.selector_samples[selector]):
+                    out.append(f"    {i+1}: {text}")
                 found_elements = True
             
         if not found_elements:
-            print("  ❌ No elements found with common price selectors")
+            out.append("  ❌ No elements found with common price selectors")
         
         # Look for text containing "kr"
-        print("\n💰 Searching for text containing 'kr'...")
-        text_content = soup.get_text()
-        kr_matches = re.findall(r'.{0,20}\d+[.\s,]*kr.{0,20}', text_content, re.IGNORECASE)
-        
-        if kr_matches:
-            print(f"  ✅ Found {len(kr_matches)} 'kr' price patterns:")
-            for i, match in enumerate(kr_matches[:10]):  # Show first 10
-                print(f"    {i+1}: {match.strip()}")
+        out.append("\n💰 Searching for text containing 'kr'...")
+        if kr_scanner.count:
+            out.append(f"  ✅ Found {kr_scanner.count} 'kr' price patterns:")
+            for i, match in enumerate(kr_scanner.samples):
+                out.append(f"    {i+1}: {match}")
         else:
-            print("  ❌ No 'kr' patterns found")
+            out.append("  ❌ No 'kr' patterns found")
         
         # Look for any elements that might contain prices
-        print("\n🧩 Looking for divs/spans that might contain prices...")
-        all_divs_spans = soup.find_all(['div', 'span'])
-        price_candidates = []
-        
-        for elem in all_divs_spans:
-            text = elem.get_text(strip=True)
-            if re.search(r'\d+.*kr', text, re.IGNORECASE):
-                price_candidates.append((elem.get('class', []), text))
+        out.append("\n🧩 Looking for divs/spans that might contain prices...")
+        price_candidates = scanner.price_candidates
         
         if price_candidates:
-            print(f"  ✅ Found {len(price_candidates)} potential price elements:")
+            out.append(f"  ✅ Found {len(price_candidates)} potential price elements:")
             for i, (classes, text) in enumerate(price_candidates[:5]):
-                print(f"    {i+1}: classes={classes}, text='{text}'")
+                out.append(f"    {i+1}: classes={classes}, text='{text}'")
         else:
-            print("  ❌ No potential price elements found")
+            out.append("  ❌ No potential price elements found")
             
         # Check if this might be a JavaScript-heavy page
-        scripts = soup.find_all('script')
-        if len(scripts) > 5:
-            print(f"\n⚠️  Page has {len(scripts)} script tags - might be JavaScript-heavy")
+        if scanner.scripts > 5:
+            out.append(f"\n⚠️  Page has {scanner.scripts} script tags - might be JavaScript-heavy")
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        out.append(f"❌ Error: {e}")
+    finally:
+        sys.stdout.write('\n'.join(out) + '\n')
 
 if __name__ == "__main__":
     debug_blocket_page()
\ No newline at end of file
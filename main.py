@@ -10,14 +10,14 @@ Author: PriceTracker
 
 import os
 import sys
-import json
 import logging
 import argparse
+import functools
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-import schedule
 from dotenv import load_dotenv
+from pydantic import TypeAdapter
 
 # Import our modules
 from models import Product, PriceRecord, NotificationConfig
@@ -26,6 +26,20 @@ from notification_service import NotificationService
 from storage import PriceStorage
 
 
+# Candidate price selectors probed by --test-scraper
+TEST_SELECTORS = (
+    ".price-large",
+    ".price",
+    ".current-price",
+    ".product-price",
+    "[data-testid*='price']",
+    ".price-value"
+)
+
+# Validates products.json straight from bytes, without building Python dicts first
+_PRODUCTS_ADAPTER = TypeAdapter(List[Product])
+
+
 def setup_logging(log_level: str = "INFO", log_file: str = None):
     """Setup logging configuration"""
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -49,28 +63,31 @@ def setup_logging(log_level: str = "INFO", log_file: str = None):
 
 
 def load_products(products_file: str = "products.json") -> List[Product]:
-    """Load products from configuration file"""
+    """Load products from configuration file, reparsing only when it changes"""
     try:
         if not os.path.isabs(products_file):
             script_dir = os.path.dirname(os.path.abspath(__file__))
             products_file = os.path.join(script_dir, products_file)
         
-        with open(products_file, 'r', encoding='utf-8') as f:
-            products_data = json.load(f)
-        
-        products = []
-        for product_data in products_data:
-            product = Product(**product_data)
-            products.append(product)
-        
-        logging.info(f"Loaded {len(products)} products from {products_file}")
-        return products
+        # The modification time is part of the cache key, so edits are picked up
+        return list(_read_products(products_file, os.stat(products_file).st_mtime_ns))
         
     except Exception as e:
         logging.error(f"Failed to load products from {products_file}: {e}")
         return []
 
 
+@functools.lru_cache(maxsize=1)
+def _read_products(products_file: str, mtime_ns: int) -> List[Product]:
+    """Parse and validate the products file"""
+    with open(products_file, 'rb') as f:
+        products = _PRODUCTS_ADAPTER.validate_json(f.read())
+    
+    logging.info(f"Loaded {len(products)} products from {products_file}")
+    return products
+
+
+@functools.lru_cache(maxsize=1)
 def load_notification_config() -> NotificationConfig:
     """Load notification configuration from environment variables"""
     return NotificationConfig(
@@ -83,20 +100,27 @@ def load_notification_config() -> NotificationConfig:
     )
 
 
-def should_notify(current_record: PriceRecord, previous_record: PriceRecord = None) -> bool:
-    """Determine if a notification should be sent"""
-    if current_record.target_price_reached:
-        return True
-    
-    if previous_record and current_record.current_price < previous_record.current_price:
-        current_record.price_dropped = True
-        current_record.previous_price = previous_record.current_price
-        return True
+def compute_notify_state(current_record: PriceRecord,
+                         previous_record: PriceRecord = None) -> Tuple[bool, PriceRecord]:
+    """
+    Determine if a notification should be sent
     
+    Returns the decision along with the record to store and notify about,
+    which is a copy marked with the price drop when one is detected.
+    """
     if previous_record is None:
-        return True
+        return True, current_record
     
-    return False
+    if current_record.target_price_reached:
+        return True, current_record
+    
+    if current_record.current_price < previous_record.current_price:
+        return True, current_record.model_copy(update={
+            'price_dropped': True,
+            'previous_price': previous_record.current_price
+        })
+    
+    return False, current_record
 
 
 def scrape_and_notify():
@@ -104,6 +128,7 @@ def scrape_and_notify():
     logger = logging.getLogger(__name__)
     logger.info("Starting price scraping cycle")
     
+    scraper = notification_service = storage = None
     try:
         products = load_products()
         if not products:
@@ -112,41 +137,62 @@ def scrape_and_notify():
         
         notification_config = load_notification_config()
         
+        notification_service = NotificationService(notification_config)
+        storage = PriceStorage()
+        url_hints, host_hints = storage.get_selector_hints()
+        
         scraper = UnifiedScraper(
             user_agent=os.getenv("USER_AGENT"),
             max_retries=int(os.getenv("MAX_RETRIES", 3)),
-            retry_delay=int(os.getenv("RETRY_DELAY_SECONDS", 5))
+            retry_delay=int(os.getenv("RETRY_DELAY_SECONDS", 5)),
+            http_validators=storage.get_http_validators(),
+            url_hints=url_hints,
+            host_hints=host_hints
         )
         
-        notification_service = NotificationService(notification_config)
-        storage = PriceStorage()
+        # Previous records let unchanged pages be answered with a 304
+        previous_records = [storage.get_latest_price(product.name) for product in products]
         
-        for product in products:
+        # Scrape all products concurrently; the pool size bounds concurrency and
+        # the scraper spaces out requests to the same host
+        current_records = scraper.scrape_many(
+            products,
+            max_workers=int(os.getenv("MAX_CONCURRENT_SCRAPES", 4)),
+            previous_records=previous_records
+        )
+        
+        pending_records: List[PriceRecord] = []
+        for product, previous_record, current_record in zip(products, previous_records, current_records):
             logger.info(f"Processing {product.name}")
-            previous_record = storage.get_latest_price(product.name)
-            
-            # Scrape current price
-            current_record = scraper.scrape_product_price(product)
             
             if current_record is None:
                 logger.warning(f"Failed to scrape price for {product.name}")
                 continue
             
-            storage.save_price_record(current_record)
+            notify, current_record = compute_notify_state(current_record, previous_record)
+            pending_records.append(current_record)
             
-            if should_notify(current_record, previous_record):
+            if notify:
                 logger.info(f"Sending notification for {product.name}")
                 notification_service.send_notification(current_record)
             else:
                 logger.info(f"No notification needed for {product.name}")
-            
-            time.sleep(2)
         
-        scraper.close()
+        if pending_records:
+            storage.save_price_records(pending_records)
+        storage.save_http_validators(scraper.http_validators)
+        storage.save_selector_hints(scraper.url_hints, scraper.host_hints)
+        
         logger.info("Completed price scraping cycle")
         
     except Exception as e:
         logger.error(f"Error in scraping cycle: {e}")
+    
+    finally:
+        # Release sessions and the database connection even after a failed cycle
+        for resource in (scraper, notification_service, storage):
+            if resource is not None:
+                resource.close()
 
 
 def test_scraper(url: str):
@@ -155,16 +201,7 @@ def test_scraper(url: str):
     
     scraper = UnifiedScraper()
     
-    selectors = [
-        ".price-large",
-        ".price",
-        ".current-price",
-        ".product-price",
-        "[data-testid*='price']",
-        ".price-value"
-    ]
-    
-    results = scraper.test_selectors(url, selectors)
+    results = scraper.test_selectors(url, TEST_SELECTORS)
     
     print("\nSelector test results:")
     for selector, result in results.items():
@@ -185,6 +222,7 @@ def test_notifications():
     notification_service = NotificationService(notification_config)
     
     success = notification_service.send_test_notification()
+    notification_service.close()
     
     if success:
         print("✅ Test notification sent successfully!")
@@ -206,13 +244,15 @@ def run_scheduler():
     
     logger.info(f"Scheduling scraper to run every {interval_hours} hours")
     
-    schedule.every(interval_hours).hours.do(scrape_and_notify)
-    
-    scrape_and_notify()
+    # Sleep straight through to the next cycle instead of polling a timer
+    interval_seconds = interval_hours * 3600
+    next_run = time.monotonic()
     
     while True:
-        schedule.run_pending()
-        time.sleep(60)
+        scrape_and_notify()
+        # A cycle that overruns the interval starts the next one right away
+        next_run = max(next_run + interval_seconds, time.monotonic())
+        time.sleep(max(0, next_run - time.monotonic()))
 
 
 def main():
@@ -1,10 +1,12 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, HttpUrl, validator
+from pydantic import BaseModel, ConfigDict, HttpUrl, field_validator
 from datetime import datetime
 
 
 class Product(BaseModel):
     """Model for a product to monitor"""
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True)
+    
     name: str
     url: HttpUrl
     target_price: Optional[float] = None
@@ -13,13 +15,15 @@ class Product(BaseModel):
     min_price: Optional[float] = None  # Minimum price filter (for Blocket)
     max_price: Optional[float] = None  # Maximum price filter (for Blocket)
     
-    @validator('name')
+    @field_validator('name')
+    @classmethod
     def name_must_not_be_empty(cls, v):
-        if not v.strip():
+        if not v:
             raise ValueError('Product name cannot be empty')
-        return v.strip()
+        return v
     
-    @validator('platform')
+    @field_validator('platform')
+    @classmethod
     def validate_platform(cls, v):
         valid_platforms = ['prisjakt', 'blocket']
         if v not in valid_platforms:
@@ -29,6 +33,8 @@ class Product(BaseModel):
 
 class PriceRecord(BaseModel):
     """Model for a price record"""
+    model_config = ConfigDict(frozen=True)
+    
     product_name: str
     current_price: float
     previous_price: Optional[float] = None
@@ -36,11 +42,6 @@ class PriceRecord(BaseModel):
     url: str
     price_dropped: bool = False
     target_price_reached: bool = False
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class NotificationConfig(BaseModel):
@@ -52,7 +53,8 @@ class NotificationConfig(BaseModel):
     twilio_phone_number: Optional[str] = None
     recipient_phone_number: Optional[str] = None
     
-    @validator('method')
+    @field_validator('method')
+    @classmethod
     def validate_notification_method(cls, v):
         valid_methods = ['pushbullet', 'sms', 'both']
         if v not in valid_methods:
@@ -1,10 +1,18 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from pushbullet import Pushbullet
 from twilio.rest import Client
 from models import NotificationConfig, PriceRecord
 
 
+# Message templates, filled in per notification by _format_message
+TITLE_TEMPLATE = "Price Update: {name}"
+CURRENT_PRICE_TEMPLATE = "Current price: {price} SEK"
+PREVIOUS_PRICE_TEMPLATE = "Previous price: {price} SEK ({symbol} {change:+.2f} SEK)"
+UPDATED_TEMPLATE = "Updated: {timestamp:%Y-%m-%d %H:%M}"
+
+
 class NotificationService:
     """
     Service for sending notifications via multiple channels
@@ -17,6 +25,8 @@ class NotificationService:
         self.logger = logging.getLogger(__name__)
         self.pushbullet = None
         self.twilio_client = None
+        # One worker per channel so Pushbullet and SMS are sent in parallel
+        self._pool = ThreadPoolExecutor(max_workers=2)
         
         if config.method in ['pushbullet', 'both']:
             if config.pushbullet_api_key:
@@ -40,37 +50,41 @@ class NotificationService:
     def send_notification(self, price_record: PriceRecord) -> bool:
         """Send notification about price update"""
         title, message = self._format_message(price_record)
-        
-        success = True
+        return self._send_to_channels(title, message, price_record.url)
+    
+    def _send_to_channels(self, title: str, message: str, url: str) -> bool:
+        """Send to every configured channel concurrently"""
+        futures = []
         
         if self.config.method in ['pushbullet', 'both'] and self.pushbullet:
-            success &= self._send_pushbullet(title, message, price_record.url)
+            futures.append(self._pool.submit(self._send_pushbullet, title, message, url))
         if self.config.method in ['sms', 'both'] and self.twilio_client:
-            success &= self._send_sms(f"{title}\n{message}")
+            futures.append(self._pool.submit(self._send_sms, f"{title}\n{message}"))
         
-        return success
+        results = [future.result() for future in futures]
+        return all(results)
     
     def _format_message(self, price_record: PriceRecord) -> tuple[str, str]:
         """Format notification message"""
-        title = f"Price Update: {price_record.product_name}"
+        title = TITLE_TEMPLATE.format(name=price_record.product_name)
         
         message_parts = [
-            f"Current price: {price_record.current_price} SEK"
+            CURRENT_PRICE_TEMPLATE.format(price=price_record.current_price)
         ]
         
         if price_record.previous_price:
             price_change = price_record.current_price - price_record.previous_price
-            change_symbol = "📉" if price_change < 0 else "📈"
-            message_parts.append(
-                f"Previous price: {price_record.previous_price} SEK ({change_symbol} {price_change:+.2f} SEK)"
-            )
+            change_symbol = "\N{CHART WITH DOWNWARDS TREND}" if price_change < 0 else "\N{CHART WITH UPWARDS TREND}"
+            message_parts.append(PREVIOUS_PRICE_TEMPLATE.format(
+                price=price_record.previous_price, symbol=change_symbol, change=price_change
+            ))
         
         if price_record.target_price_reached:
-            message_parts.append("🎯 TARGET PRICE REACHED!")
+            message_parts.append("\N{DIRECT HIT} TARGET PRICE REACHED!")
         elif price_record.price_dropped:
-            message_parts.append("💰 Price dropped!")
+            message_parts.append("\N{MONEY BAG} Price dropped!")
         
-        message_parts.append(f"Updated: {price_record.timestamp.strftime('%Y-%m-%d %H:%M')}")
+        message_parts.append(UPDATED_TEMPLATE.format(timestamp=price_record.timestamp))
         
         return title, "\n".join(message_parts)
     
@@ -104,15 +118,11 @@ class NotificationService:
             title = "Price Scraper Test"
             message = "This is a test notification from your Prisjakt price scraper!"
             
-            success = True
-            
-            if self.config.method in ['pushbullet', 'both'] and self.pushbullet:
-                success &= self._send_pushbullet(title, message, "https://prisjakt.nu")
-            
-            if self.config.method in ['sms', 'both'] and self.twilio_client:
-                success &= self._send_sms(f"{title}\n{message}")
-            
-            return success
+            return self._send_to_channels(title, message, "https://prisjakt.nu")
         except Exception as e:
             self.logger.error(f"Failed to send test notification: {e}")
             return False
+    
+    def close(self):
+        """Wait for pending notifications and stop the worker threads"""
+        self._pool.shutdown(wait=True)
@@ -1,13 +1,158 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import functools
+import html
 import re
-import time
 import logging
-from typing import Optional, Dict, Any, List
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable, List, Tuple
 from urllib.parse import urljoin, urlparse
+from lxml import etree
+from cssselect import HTMLTranslator, SelectorError
+from cssselect.xpath import ExpressionError
 from models import Product, PriceRecord
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+# Swedish price patterns fused into one alternation with the shared "kr"
+# suffix factored out, so the page text is scanned once; alternatives are
+# tried in order at each position and group 1 is always the number
+_PRICE_RE = re.compile(
+    r'('
+    r'\d{1,3}(?:\s\d{3})+'         # "3 997 kr" (space-separated thousands)
+    r'|\d{1,3}(?:,\d{3})+'         # "3,997 kr" (comma-separated thousands)
+    r'|\d{4,6}'                    # "3997 kr" (no separators, 4-6 digits)
+    r'|\d{1,3}'                    # "997 kr" (1-3 digits for hundreds)
+    r')\s*kr',
+    re.IGNORECASE
+)
+# Markup that BeautifulSoup's get_text() leaves out: comments, the contents
+# of script/style/template elements, and the tags themselves
+_MARKUP_RE = re.compile(
+    r'<!--.*?-->|<(script|style|template)\b[^>]*>.*?</\1\s*>|<[^>]+>',
+    re.IGNORECASE | re.DOTALL
+)
+# Everything except digits, separators and whitespace in a price string
+_PRICE_JUNK_RE = re.compile(r'[^\d,.\s]')
+# Text nodes BeautifulSoup's get_text() would return for an element
+_ELEMENT_TEXT = etree.XPath(
+    'descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]'
+)
+# ASCII-only equivalent of _PRICE_JUNK_RE for str.translate
+_PRICE_JUNK_TABLE = {c: None for c in range(128) if _PRICE_JUNK_RE.match(chr(c))}
+
+_CHUNK_SIZE = 65536
+
+
+class _DelayedRetry(Retry):
+    """Retry that also waits backoff_factor before the first retry, which urllib3 fires at once"""
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff == 0 and self.history and self.history[-1].redirect_location is None:
+            # Jittered like the later retries, urllib3 adds none when it returns 0
+            backoff = min(self.backoff_max, self.backoff_factor + random.random() * self.backoff_jitter)
+        return backoff
+
+
+def _mount_retry_adapter(session: requests.Session, max_retries: int, retry_delay: int):
+    """Let urllib3 pool connections and retry failed requests with jittered backoff"""
+    retry = _DelayedRetry(
+        total=max(0, max_retries - 1),
+        backoff_factor=retry_delay,
+        backoff_jitter=retry_delay / 2,  # spread out retries that failed together
+        backoff_max=60,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> Optional[etree.XPath]:
+    """Compile a CSS selector to an lxml XPath once, None if only soupsieve understands it"""
+    try:
+        # cssselect spells soupsieve's :-soup-contains() as :contains()
+        css = selector.replace(':-soup-contains(', ':contains(')
+        return etree.XPath(HTMLTranslator().css_to_xpath(css))
+    except (SelectorError, ExpressionError):
+        return None
+
+
+def _parse_price_text(price_text: str) -> Optional[float]:
+    """Parse price from text string"""
+    # Remove currency symbols and text, then the thousands-separating spaces
+    # Swedish format: 1 234,56 or 1234,56
+    # English format: 1,234.56 or 1234.56
+    if price_text.isascii():
+        cleaned_text = price_text.translate(_PRICE_JUNK_TABLE)
+    else:
+        cleaned_text = _PRICE_JUNK_RE.sub('', price_text)
+    cleaned_text = cleaned_text.strip().replace(' ', '')
+    
+    # Decide the separator handling once from the last comma and dot
+    comma_pos = cleaned_text.rfind(',')
+    dot_pos = cleaned_text.rfind('.')
+    if comma_pos >= 0:
+        if dot_pos >= 0:
+            if comma_pos > dot_pos:
+                cleaned_text = cleaned_text.replace('.', '').replace(',', '.')
+            else:
+                cleaned_text = cleaned_text.replace(',', '')
+        elif len(cleaned_text) - comma_pos <= 3:
+            cleaned_text = cleaned_text.replace(',', '.')
+        else:
+            cleaned_text = cleaned_text.replace(',', '')
+    
+    try:
+        price = float(cleaned_text)
+    except ValueError:
+        return None
+    
+    if 0 <= price <= 10000000:
+        return price
+    return None
+
+
+class ScrapedPage:
+    """A fetched page whose DOM is only built when a CSS selector needs it"""
+    
+    __slots__ = ('content', 'text', 'etag', 'last_modified', '_tree', '_soup')
+    
+    def __init__(self, content: bytes, text: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None):
+        self.content = content
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self._tree = None
+        self._soup = None
+    
+    @property
+    def tree(self) -> etree._Element:
+        if self._tree is None:
+            tree = etree.fromstring(self.text.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+            self._tree = tree if tree is not None else etree.Element('html')
+        return self._tree
+    
+    @property
+    def soup(self) -> 'BeautifulSoup':
+        if self._soup is None:
+            # bs4 is only imported once a CSS selector needs a DOM
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.content, 'lxml')
+        return self._soup
+
 
 class PrisjaktScraper:
     """
@@ -17,217 +162,363 @@ class PrisjaktScraper:
     for various Swedish price formats.
     """
     
-    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5):
-        self.session = requests.Session()
+    __slots__ = (
+        '_owns_session', 'session', 'max_retries', 'retry_delay', 'logger', 'headers',
+        'url_hints', 'host_hints',
+        '_page_cache', '_page_cache_lock', 'http_validators',
+        '_next_request_at', '_next_request_lock'
+    )
+    
+    # Upper bound on how much of a page is kept in memory
+    MAX_BYTES = 2_000_000
+    
+    # Seconds a fetched page (and its parsed soup) is reused by later scrapes
+    # of the same URL, e.g. several products tracked on one page
+    PAGE_CACHE_TTL = 60
+    
+    # Seconds between two requests to the same host, however many scrapes
+    # run concurrently (the old sequential loop paused 2 s per product)
+    MIN_REQUEST_INTERVAL = 2
+    
+    # Fallback selectors, most specific first; the kr text search runs after these
+    _ALT_SELECTORS = (
+        "[data-testid*='price']",
+        ".lowest-price",
+        ".price-box .price",
+        ".current-price",
+        ".product-price",
+        ".price-value",
+        ".price",
+        "span:-soup-contains('kr')",
+        "strong:-soup-contains('kr')",
+    )
+    
+    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5,
+                 session: Optional[requests.Session] = None,
+                 http_validators: Optional[Dict[str, Dict[str, str]]] = None,
+                 url_hints: Optional[Dict[Tuple[str, str], str]] = None,
+                 host_hints: Optional[Dict[str, str]] = None):
+        # A shared session is owned (and closed) by whoever passed it in
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            _mount_retry_adapter(session, max_retries, retry_delay)
+        self.session = session
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.logger = logging.getLogger(__name__)
         
+        # Headers are sent per request so a shared session stays platform neutral
         if user_agent:
-            self.session.headers.update({'User-Agent': user_agent})
+            self.headers = {'User-Agent': user_agent}
         else:
-            self.session.headers.update({
+            self.headers = {
                 'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
+            }
+        # Ask for compressed HTML, requests decodes gzip/deflate itself and br via brotli
+        self.headers.update({
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Language': 'sv-SE,sv;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive',
+        })
+        
+        # Fallback selector that last found a price, keyed by (product URL,
+        # product selector) and by host; the owner persists them between runs
+        self.url_hints = url_hints if url_hints is not None else {}
+        self.host_hints = host_hints if host_hints is not None else {}
+        
+        self._page_cache = {}  # url -> (monotonic fetch time, ScrapedPage)
+        self._page_cache_lock = threading.Lock()
+        
+        self._next_request_at = {}  # host -> monotonic time its next request may start
+        self._next_request_lock = threading.Lock()
+        
+        # ETag/Last-Modified of the page each product's last price came from,
+        # keyed by product name; the owner persists it between runs
+        self.http_validators = http_validators if http_validators is not None else {}
     
-    def scrape_product_price(self, product: Product) -> Optional[PriceRecord]:
-        """Scrape price for a single product"""
-        for attempt in range(self.max_retries):
-            try:
-                self.logger.info(f"Scraping price for {product.name} (attempt {attempt + 1})")
-                
-                response = self.session.get(str(product.url), timeout=30)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract price using the provided selector
-                if product.price_selector == "text_search_kr":
-                    price = self._extract_price_from_text(soup)
+    def scrape_product_price(self, product: Product,
+                             previous_record: Optional[PriceRecord] = None) -> Optional[PriceRecord]:
+        """Scrape price for a single product, reusing previous_record if the page is unchanged"""
+        url = str(product.url)
+        try:
+            self.logger.info(f"Scraping price for {product.name}")
+            
+            page = self._fetch(url, self._conditional_headers(product, previous_record))
+            
+            if page is None:
+                # 304 Not Modified, the page still shows the previous price
+                self.logger.info(f"Page unchanged for {product.name}, reusing previous price")
+                price = previous_record.current_price
+            else:
+                price = self._find_price(page, product)
+                if price is not None:
+                    self._remember_validators(product, page)
                 else:
-                    price = self._extract_price(soup, product.price_selector)
+                    self.http_validators.pop(product.name, None)
+            
+            if price is not None:
+                target_price_reached = (
+                    product.target_price is not None and 
+                    price <= product.target_price
+                )
                 
-                if price is None:
-                    alternative_selectors = [
-                        "span:contains('kr')",
-                        ".price-box .price",
-                        ".lowest-price",
-                        "strong:contains('kr')",
-                        ".price",
-                        "[data-testid*='price']",
-                        ".price-value",
-                        ".current-price",
-                        ".product-price",
-                        "text_search_kr"
-                    ]
-                    
-                    for selector in alternative_selectors:
-                        if selector == "text_search_kr":
-                            price = self._extract_price_from_text(soup)
-                        else:
-                            price = self._extract_price(soup, selector)
-                        if price is not None:
-                            self.logger.info(f"Found price using alternative selector: {selector}")
-                            break
+                price_record = PriceRecord(
+                    product_name=product.name,
+                    current_price=price,
+                    timestamp=datetime.now(),
+                    url=url,
+                    target_price_reached=target_price_reached
+                )
                 
-                if price is not None:
-                    target_price_reached = (
-                        product.target_price is not None and 
-                        price <= product.target_price
-                    )
-                    
-                    price_record = PriceRecord(
-                        product_name=product.name,
-                        current_price=price,
-                        timestamp=datetime.now(),
-                        url=str(product.url),
-                        target_price_reached=target_price_reached
-                    )
-                    
-                    self.logger.info(f"Successfully scraped price for {product.name}: {price} SEK")
-                    return price_record
-                else:
-                    self.logger.warning(f"Could not find price for {product.name}")
-                    return None
-                    
-            except requests.RequestException as e:
-                self.logger.error(f"Request failed for {product.name} (attempt {attempt + 1}): {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-            except Exception as e:
-                self.logger.error(f"Unexpected error scraping {product.name}: {e}")
+                self.logger.info(f"Successfully scraped price for {product.name}: {price} SEK")
+                return price_record
+            else:
+                self.logger.warning(f"Could not find price for {product.name}")
+                self._forget_page(url)
                 return None
+                
+        except requests.RequestException as e:
+            self.logger.error(f"Request failed for {product.name}: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error scraping {product.name}: {e}")
+            return None
+    
+    def _find_price(self, page: ScrapedPage, product: Product) -> Optional[float]:
+        """Try the product selector and the fallbacks until one finds a price"""
+        url = str(product.url)
+        
+        # Try the selector that worked last time for this URL and product
+        # selector first, then the product's own selector, the one that last
+        # worked on this host, and finally the alternatives and text search
+        selectors = [
+            self.url_hints.get((url, product.price_selector)),
+            product.price_selector,
+            self.host_hints.get(urlparse(url).netloc),
+            *self._ALT_SELECTORS,
+            "text_search_kr"
+        ]
+        
+        for selector in dict.fromkeys(filter(None, selectors)):
+            price = self._extract_price_with(page, selector)
+            if price is not None:
+                if selector != product.price_selector:
+                    self.logger.info(f"Found price using alternative selector: {selector}")
+                self._remember_selector(url, selector, product.price_selector)
+                return price
         
-        self.logger.error(f"Failed to scrape {product.name} after {self.max_retries} attempts")
         return None
     
-    def _extract_price_from_text(self, soup: BeautifulSoup) -> Optional[float]:
-        """Extract price by searching for Swedish price patterns in all text"""
-        try:
-            # Get all text content
-            page_text = soup.get_text()
+    def _conditional_headers(self, product: Product,
+                             previous_record: Optional[PriceRecord]) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers when a 304 can be answered"""
+        validators = self.http_validators.get(product.name)
+        if (previous_record is None or not validators
+                or validators.get('url') != str(product.url)
+                or validators.get('price_selector') != product.price_selector):
+            return {}
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def _remember_validators(self, product: Product, page: ScrapedPage):
+        """Record the validators of the page a product's price was read from"""
+        if page.etag or page.last_modified:
+            self.http_validators[product.name] = {
+                'url': str(product.url),
+                'price_selector': product.price_selector,
+                'etag': page.etag,
+                'last_modified': page.last_modified,
+            }
+        else:
+            self.http_validators.pop(product.name, None)
+    
+    def _extract_price_with(self, page: ScrapedPage, selector: str) -> Optional[float]:
+        """Extract price with a CSS selector, or the text search for 'text_search_kr'"""
+        if selector == "text_search_kr":
+            return self._extract_price_from_text(page.text)
+        return self._extract_price(page, selector)
+    
+    def _remember_selector(self, url: str, selector: str, price_selector: str):
+        """Record which selector found the price for a URL and its host"""
+        # Products on one URL may use different selectors, so URL hints are
+        # kept per (url, price_selector)
+        if selector == price_selector:
+            self.url_hints.pop((url, price_selector), None)
+        else:
+            self.url_hints[(url, price_selector)] = selector
+            # The host hint is tried before the alternatives on every page of
+            # the host, so the loose text search must never become one
+            if selector in self._ALT_SELECTORS:
+                self.host_hints[urlparse(url).netloc] = selector
+    
+    def _fetch(self, url: str, conditional_headers: Optional[Dict[str, str]] = None) -> Optional[ScrapedPage]:
+        """Return a recently fetched page for the URL, downloading it if needed
+        
+        Returns None when conditional_headers were sent and the server
+        answered 304 Not Modified.
+        """
+        now = time.monotonic()
+        with self._page_cache_lock:
+            cached = self._page_cache.get(url)
+            if cached is not None and now - cached[0] < self.PAGE_CACHE_TTL:
+                self.logger.debug(f"Reusing cached page for {url}")
+                return cached[1]
+        
+        page = self._download(url, conditional_headers)
+        if page is None:
+            return None
+        with self._page_cache_lock:
+            # Drop expired pages so the cache only holds the current run
+            expired = [u for u, (fetched, _) in self._page_cache.items() if now - fetched >= self.PAGE_CACHE_TTL]
+            for expired_url in expired:
+                del self._page_cache[expired_url]
+            self._page_cache[url] = (now, page)
+        return page
+    
+    def _forget_page(self, url: str):
+        """Make the next fetch of the URL go to the network"""
+        with self._page_cache_lock:
+            self._page_cache.pop(url, None)
+    
+    def _download(self, url: str, conditional_headers: Optional[Dict[str, str]] = None) -> Optional[ScrapedPage]:
+        """Download a page, reading at most MAX_BYTES of the decoded body"""
+        headers = dict(self.headers, **conditional_headers) if conditional_headers else self.headers
+        self._wait_for_host(url)
+        with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+            if conditional_headers and response.status_code == 304:
+                return None
+            response.raise_for_status()
             
-            # Look for price patterns like "3 997 kr", "3997 kr", "3,997 kr"
-            import re
+            # Don't download or parse images, JSON, PDFs and the like
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and 'html' not in content_type.lower():
+                raise ValueError(f"Unexpected content type {content_type!r} for {url}")
+            self.logger.debug(
+                f"Fetched {url}: Content-Encoding={response.headers.get('Content-Encoding', 'identity')}"
+            )
             
-            # Pattern for Swedish prices with "kr" - improved to handle space-separated thousands
-            price_patterns = [
-                r'(\d{1,3}(?:\s\d{3})+)\s*kr',    # "3 997 kr" (space-separated thousands)
-                r'(\d{1,3}(?:,\d{3})+)\s*kr',     # "3,997 kr" (comma-separated thousands)
-                r'(\d{4,6})\s*kr',                # "3997 kr" (no separators, 4-6 digits)
-                r'(\d{1,3})\s*kr',                # "997 kr" (1-3 digits for hundreds)
-            ]
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.MAX_BYTES:
+                    self.logger.warning(f"Page {url} exceeds {self.MAX_BYTES} bytes, truncating")
+                    break
             
-            found_prices = []
+            content = b''.join(chunks)[:self.MAX_BYTES]
+            return ScrapedPage(
+                content,
+                self._decode_html(response, content),
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+    
+    def _wait_for_host(self, url: str):
+        """Sleep until MIN_REQUEST_INTERVAL has passed since the last request to the URL's host"""
+        host = urlparse(url).netloc
+        with self._next_request_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at.get(host, now))
+            # Reserve the slot before sleeping, so other threads queue up behind it
+            self._next_request_at[host] = start + self.MIN_REQUEST_INTERVAL
+        if start > now:
+            time.sleep(start - now)
+    
+    def _decode_html(self, response: requests.Response, content: bytes) -> str:
+        """Decode a page, assuming UTF-8 when the server sends no charset"""
+        content_type = response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if 'charset' in content_type else 'utf-8'
+        return content.decode(encoding or 'utf-8', errors='replace')
+    
+    def _extract_price_from_text(self, page_html: str) -> Optional[float]:
+        """Extract price by searching for Swedish price patterns in all text"""
+        try:
+            # Strip the markup with a single regex pass instead of building a DOM
+            page_text = html.unescape(_MARKUP_RE.sub('', page_html))
             
-            for pattern in price_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                for match in matches:
-                    price_text = match.replace(' ', '').replace(',', '')
-                    try:
-                        price = float(price_text)
-                        if 100 <= price <= 100000:
-                            found_prices.append(price)
-                    except ValueError:
-                        continue
+            # Look for price patterns like "3 997 kr", "3997 kr", "3,997 kr"
+            # and keep a running max (the old ">= 1000 first" rule always picked the max too)
+            best_price = None
             
-            if found_prices:
-                valid_prices = [p for p in found_prices if p >= 1000]
-                if valid_prices:
-                    return max(valid_prices)
-                else:
-                    return max(found_prices)
+            for match in _PRICE_RE.finditer(page_text):
+                price_text = match.group(1).replace(' ', '').replace(',', '')
+                try:
+                    price = float(price_text)
+                except ValueError:
+                    continue
+                if 100 <= price <= 100000 and (best_price is None or price > best_price):
+                    best_price = price
             
-            return None
+            return best_price
             
         except Exception as e:
             self.logger.error(f"Error extracting price from text: {e}")
             return None
     
-    def _extract_price(self, soup: BeautifulSoup, selector: str) -> Optional[float]:
+    def _extract_price(self, page: ScrapedPage, selector: str) -> Optional[float]:
         """Extract price from HTML using CSS selector"""
         try:
-            price_elements = soup.select(selector)
-            
-            if not price_elements:
-                return None
-            
-            for element in price_elements:
-                price_text = element.get_text(strip=True)
-                price = self._parse_price_text(price_text)
-                if price is not None:
-                    return price
-            
-            return None
+            return self._extract_price_from_texts(self._select_texts(page, selector))
             
         except Exception as e:
             self.logger.error(f"Error extracting price with selector '{selector}': {e}")
             return None
     
-    def _parse_price_text(self, price_text: str) -> Optional[float]:
-        """Parse price from text string"""
-        try:
-            # Remove common currency symbols and text
-            cleaned_text = re.sub(r'[^\d,.\s]', '', price_text)
-            cleaned_text = cleaned_text.strip()
-            
-            # Handle different number formats
-            # Swedish format: 1 234,56 or 1234,56
-            # English format: 1,234.56 or 1234.56
-            
-            # Remove spaces
-            cleaned_text = cleaned_text.replace(' ', '')
-            
-            # If there's both comma and dot, determine which is decimal separator
-            if ',' in cleaned_text and '.' in cleaned_text:
-                if cleaned_text.rfind(',') > cleaned_text.rfind('.'):
-                    cleaned_text = cleaned_text.replace('.', '').replace(',', '.')
-                else:
-                    cleaned_text = cleaned_text.replace(',', '')
-            elif ',' in cleaned_text:
-                comma_pos = cleaned_text.rfind(',')
-                if len(cleaned_text) - comma_pos <= 3:
-                    cleaned_text = cleaned_text.replace(',', '.')
-                else:
-                    cleaned_text = cleaned_text.replace(',', '')
-            
-            price = float(cleaned_text)
-            
-            if 0 <= price <= 10000000:
+    def _select_texts(self, page: ScrapedPage, selector: str) -> Iterable[str]:
+        """Yield the stripped text of each element matching a CSS selector"""
+        matcher = _compile_selector(selector)
+        if matcher is not None:
+            return (
+                ''.join(text.strip() for text in _ELEMENT_TEXT(element))
+                for element in matcher(page.tree)
+            )
+        
+        # Selectors cssselect can't translate go through BeautifulSoup;
+        # iselect matches lazily, so the walk stops at the first parseable price
+        return (element.get_text(strip=True) for element in page.soup.css.iselect(selector))
+    
+    def _extract_price_from_texts(self, price_texts: Iterable[str]) -> Optional[float]:
+        """Return the first parseable price among already selected element texts"""
+        for price_text in price_texts:
+            price = _parse_price_text(price_text)
+            if price is not None:
                 return price
-            else:
-                return None
-                
-        except (ValueError, AttributeError):
-            return None
+        
+        return None
     
     def test_selectors(self, url: str, selectors: list) -> Dict[str, Any]:
         """Test multiple selectors on a URL to find the best one"""
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            page = self._fetch(url)
+            page_html = page.text
             results = {}
             
-            all_selectors = selectors + ["text_search_kr"]
+            all_selectors = list(selectors) + ["text_search_kr"]
             
             for selector in all_selectors:
                 if selector == "text_search_kr":
-                    price = self._extract_price_from_text(soup)
+                    price = self._extract_price_from_text(page_html)
                     results[selector] = {
                         'price': price,
                         'elements_found': 'text_search',
                         'sample_text': 'Searches for kr prices in all page text'
                     }
                 else:
-                    price = self._extract_price(soup, selector)
-                    elements = soup.select(selector)
+                    # Select once and reuse the texts for both price and sample text
+                    texts = list(self._select_texts(page, selector))
+                    price = self._extract_price_from_texts(texts)
                     results[selector] = {
                         'price': price,
-                        'elements_found': len(elements),
-                        'sample_text': elements[0].get_text(strip=True)[:100] + '...' if elements else None
+                        'elements_found': len(texts),
+                        'sample_text': texts[0][:100] + '...' if texts else None
                     }
             
             return results
@@ -237,8 +528,10 @@ class PrisjaktScraper:
             return {}
     
     def close(self):
-        """Close the session"""
-        self.session.close()
+        """Close the session if this scraper created it"""
+        self._page_cache.clear()
+        if self._owns_session:
+            self.session.close()
 
 
 class BlocketScraper:
@@ -249,26 +542,34 @@ class BlocketScraper:
     for loading content, this scraper uses alternative approaches to get pricing data.
     """
     
-    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5):
-        self.session = requests.Session()
+    __slots__ = ('_owns_session', 'session', 'max_retries', 'retry_delay', 'logger', 'headers')
+    
+    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5,
+                 session: Optional[requests.Session] = None):
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            _mount_retry_adapter(session, max_retries, retry_delay)
+        self.session = session
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.logger = logging.getLogger(__name__)
         
         if user_agent:
-            self.session.headers.update({'User-Agent': user_agent})
+            self.headers = {'User-Agent': user_agent}
         else:
             # Use a more modern user agent that Blocket might accept better
-            self.session.headers.update({
+            self.headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'sv-SE,sv;q=0.9,en;q=0.8',
                 'Accept-Encoding': 'gzip, deflate, br',
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
-            })
+            }
     
-    def scrape_product_price(self, product: Product) -> Optional[PriceRecord]:
+    def scrape_product_price(self, product: Product,
+                             previous_record: Optional[PriceRecord] = None) -> Optional[PriceRecord]:
         """
         Scrape prices for Blocket search results
         
@@ -294,8 +595,9 @@ class BlocketScraper:
         return price_record
     
     def close(self):
-        """Close the session"""
-        self.session.close()
+        """Close the session if this scraper created it"""
+        if self._owns_session:
+            self.session.close()
 
 
 class ScraperFactory:
@@ -304,12 +606,19 @@ class ScraperFactory:
     """
     
     @staticmethod
-    def create_scraper(product: Product, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5):
+    def create_scraper(product: Product, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5,
+                       session: Optional[requests.Session] = None,
+                       http_validators: Optional[Dict[str, Dict[str, str]]] = None,
+                       url_hints: Optional[Dict[Tuple[str, str], str]] = None,
+                       host_hints: Optional[Dict[str, str]] = None):
         """Create appropriate scraper based on product platform"""
         if product.platform == "prisjakt":
-            return PrisjaktScraper(user_agent, max_retries, retry_delay)
+            return PrisjaktScraper(
+                user_agent, max_retries, retry_delay, session=session,
+                http_validators=http_validators, url_hints=url_hints, host_hints=host_hints
+            )
         elif product.platform == "blocket":
-            return BlocketScraper(user_agent, max_retries, retry_delay)
+            return BlocketScraper(user_agent, max_retries, retry_delay, session=session)
         else:
             raise ValueError(f"Unsupported platform: {product.platform}")
 
@@ -319,41 +628,115 @@ class UnifiedScraper:
     Unified scraper that can handle multiple platforms
     """
     
-    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5):
+    __slots__ = (
+        'user_agent', 'max_retries', 'retry_delay', 'scrapers', '_scrapers_lock', 'logger', 'session',
+        'http_validators', 'url_hints', 'host_hints'
+    )
+    
+    def __init__(self, user_agent: str = None, max_retries: int = 3, retry_delay: int = 5,
+                 http_validators: Optional[Dict[str, Dict[str, str]]] = None,
+                 url_hints: Optional[Dict[Tuple[str, str], str]] = None,
+                 host_hints: Optional[Dict[str, str]] = None):
         self.user_agent = user_agent
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.scrapers = {}  # Cache scrapers
+        self._scrapers_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
+        
+        # One connection pool shared by every platform scraper
+        self.session = requests.Session()
+        _mount_retry_adapter(self.session, max_retries, retry_delay)
+        
+        # Conditional GET validators, shared with the scrapers and updated in place
+        self.http_validators = http_validators if http_validators is not None else {}
+        self.url_hints = url_hints if url_hints is not None else {}
+        self.host_hints = host_hints if host_hints is not None else {}
     
-    def scrape_product_price(self, product: Product) -> Optional[PriceRecord]:
-        """Scrape price using appropriate scraper for the product platform"""
-        try:
-            # Get or create scraper for this platform
+    def _get_scraper(self, product: Product):
+        """Get or create the scraper for the product platform"""
+        with self._scrapers_lock:
             if product.platform not in self.scrapers:
                 self.scrapers[product.platform] = ScraperFactory.create_scraper(
-                    product, self.user_agent, self.max_retries, self.retry_delay
+                    product, self.user_agent, self.max_retries, self.retry_delay,
+                    session=self.session, http_validators=self.http_validators,
+                    url_hints=self.url_hints, host_hints=self.host_hints
                 )
-            
-            scraper = self.scrapers[product.platform]
-            return scraper.scrape_product_price(product)
+            return self.scrapers[product.platform]
+    
+    def scrape_product_price(self, product: Product,
+                             previous_record: Optional[PriceRecord] = None) -> Optional[PriceRecord]:
+        """Scrape price using appropriate scraper for the product platform"""
+        try:
+            scraper = self._get_scraper(product)
+            return scraper.scrape_product_price(product, previous_record)
             
         except Exception as e:
             self.logger.error(f"Error scraping {product.name} from {product.platform}: {e}")
             return None
     
+    def scrape_many(self, products: List[Product], max_workers: int = 4,
+                    previous_records: Optional[List[Optional[PriceRecord]]] = None) -> List[Optional[PriceRecord]]:
+        """Scrape prices for several products concurrently, results in product order"""
+        if previous_records is None:
+            previous_records = [None] * len(products)
+        
+        # Prisjakt products tracking the same page with the same selector are
+        # scraped once; Blocket results depend on each product's price filters
+        groups: Dict[tuple, List[int]] = {}
+        for index, product in enumerate(products):
+            if product.platform == "prisjakt":
+                key = (str(product.url), product.price_selector)
+            else:
+                key = (index,)
+            groups.setdefault(key, []).append(index)
+        firsts = [indexes[0] for indexes in groups.values()]
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            scraped = list(executor.map(
+                self.scrape_product_price,
+                [products[i] for i in firsts],
+                [previous_records[i] for i in firsts]
+            ))
+        
+        records: List[Optional[PriceRecord]] = [None] * len(products)
+        for indexes, record in zip(groups.values(), scraped):
+            for index in indexes:
+                records[index] = record if record is None else self._record_for(products[index], record)
+        return records
+    
+    def _record_for(self, product: Product, record: PriceRecord) -> PriceRecord:
+        """Adapt a record scraped for another product on the same page"""
+        if record.product_name == product.name:
+            return record
+        return record.model_copy(update={
+            'product_name': product.name,
+            'target_price_reached': (
+                product.target_price is not None and
+                record.current_price <= product.target_price
+            )
+        })
+    
     def test_selectors(self, url: str, selectors: list) -> Dict[str, Any]:
         """Test selectors - only works for Prisjakt products"""
         # For now, assume it's a Prisjakt URL if testing selectors
-        if "prisjakt" not in self.scrapers:
-            self.scrapers["prisjakt"] = PrisjaktScraper(self.user_agent, self.max_retries, self.retry_delay)
+        with self._scrapers_lock:
+            if "prisjakt" not in self.scrapers:
+                self.scrapers["prisjakt"] = PrisjaktScraper(
+                    self.user_agent, self.max_retries, self.retry_delay,
+                    session=self.session, http_validators=self.http_validators,
+                    url_hints=self.url_hints, host_hints=self.host_hints
+                )
+            scraper = self.scrapers["prisjakt"]
         
-        if hasattr(self.scrapers["prisjakt"], 'test_selectors'):
-            return self.scrapers["prisjakt"].test_selectors(url, selectors)
+        if hasattr(scraper, 'test_selectors'):
+            return scraper.test_selectors(url, selectors)
         return {}
     
     def close(self):
         """Close all scrapers"""
-        for scraper in self.scrapers.values():
-            scraper.close()
-        self.scrapers.clear()
+        with self._scrapers_lock:
+            for scraper in self.scrapers.values():
+                scraper.close()
+            self.scrapers.clear()
+        self.session.close()
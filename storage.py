@@ -1,13 +1,57 @@
 import json
 import os
-from typing import List, Dict, Optional
+import sqlite3
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from models import Product, PriceRecord
 import logging
 
 
+# Records kept per product, older ones are trimmed on save
+MAX_RECORDS_PER_PRODUCT = 100
+
+# PRAGMA user_version once the old JSON file has been imported (or there was none)
+JSON_MIGRATED_VERSION = 1
+
+PRICE_COLUMNS = (
+    'product_name', 'current_price', 'previous_price', 'timestamp',
+    'url', 'price_dropped', 'target_price_reached'
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    id INTEGER PRIMARY KEY,
+    product_name TEXT NOT NULL,
+    current_price REAL NOT NULL,
+    previous_price REAL,
+    timestamp TEXT NOT NULL,
+    url TEXT NOT NULL,
+    price_dropped INTEGER NOT NULL DEFAULT 0,
+    target_price_reached INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS prices_product_id ON prices (product_name, id);
+CREATE TABLE IF NOT EXISTS http_validators (
+    product_name TEXT PRIMARY KEY,
+    url TEXT,
+    price_selector TEXT,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE TABLE IF NOT EXISTS url_selector_hints (
+    url TEXT NOT NULL,
+    price_selector TEXT NOT NULL,
+    selector TEXT NOT NULL,
+    PRIMARY KEY (url, price_selector)
+);
+CREATE TABLE IF NOT EXISTS host_selector_hints (
+    host TEXT PRIMARY KEY,
+    selector TEXT NOT NULL
+);
+"""
+
+
 class PriceStorage:
-    """Simple JSON-based storage for price history"""
+    """SQLite storage for price history, migrated from the old JSON file on first use"""
     
     def __init__(self, storage_file: str = "price_history.json"):
         if not os.path.isabs(storage_file):
@@ -16,53 +60,82 @@ class PriceStorage:
                 script_dir = os.path.dirname(os.path.abspath(sys.modules['__main__'].__file__))
                 storage_file = os.path.join(script_dir, storage_file)
         
+        # The database lives next to the JSON file it replaces
         self.storage_file = storage_file
+        self.db_file = os.path.splitext(storage_file)[0] + ".db"
         self.logger = logging.getLogger(__name__)
-        self._ensure_storage_file()
+        self._connect()
     
-    def _ensure_storage_file(self):
-        """Create storage file if it doesn't exist"""
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w') as f:
-                json.dump({}, f)
-            self.logger.info(f"Created storage file: {self.storage_file}")
+    def _connect(self):
+        """Open the database in WAL mode and create the schema"""
+        is_new = not os.path.exists(self.db_file)
+        
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        
+        if is_new:
+            self.logger.info(f"Created storage database: {self.db_file}")
+        
+        # A failed import leaves the version unset, so it is retried on the next start
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < JSON_MIGRATED_VERSION:
+            self._migrate_json()
+    
+    def _migrate_json(self):
+        """Import the records of the old JSON storage file, if there is one"""
+        try:
+            records = []
+            if os.path.exists(self.storage_file):
+                with open(self.storage_file, 'r') as f:
+                    data = json.load(f)
+                
+                for product_name, product_records in data.items():
+                    for record in product_records[-MAX_RECORDS_PER_PRODUCT:]:
+                        record = dict(record, product_name=product_name)
+                        records.append(tuple(record.get(column) for column in PRICE_COLUMNS))
+            
+            # The records and the version are committed together
+            with self.conn:
+                self._insert_rows(records)
+                self.conn.execute(f"PRAGMA user_version = {JSON_MIGRATED_VERSION}")
+            if records:
+                self.logger.info(f"Migrated {len(records)} price records from {self.storage_file}")
+        
+        except Exception as e:
+            self.logger.error(f"Failed to migrate {self.storage_file}: {e}")
     
     def save_price_record(self, price_record: PriceRecord):
         """Save a price record to storage"""
+        self.save_price_records([price_record])
+    
+    def save_price_records(self, price_records: List[PriceRecord]):
+        """Save several price records in a single transaction"""
         try:
-            data = self._load_data()
-            
-            product_name = price_record.product_name
-            if product_name not in data:
-                data[product_name] = []
-            
-            # Add the new record
-            record_dict = price_record.dict()
-            record_dict['timestamp'] = price_record.timestamp.isoformat()
-            data[product_name].append(record_dict)
-            
-            # Keep only last 100 records per product
-            data[product_name] = data[product_name][-100:]
-            
-            self._save_data(data)
-            self.logger.info(f"Saved price record for {product_name}")
-            
+            with self.conn:
+                self._insert_rows([self._to_row(record) for record in price_records])
+                for product_name in {record.product_name for record in price_records}:
+                    self._trim(product_name)
+            self.logger.info(f"Saved {len(price_records)} price records")
+        
         except Exception as e:
-            self.logger.error(f"Failed to save price record: {e}")
+            self.logger.error(f"Failed to save price records: {e}")
     
     def get_latest_price(self, product_name: str) -> Optional[PriceRecord]:
         """Get the latest price record for a product"""
         try:
-            data = self._load_data()
+            row = self.conn.execute(
+                f"SELECT {', '.join(PRICE_COLUMNS)} FROM prices "
+                "WHERE product_name = ? ORDER BY id DESC LIMIT 1",
+                (product_name,)
+            ).fetchone()
             
-            if product_name not in data or not data[product_name]:
+            if row is None:
                 return None
             
-            latest_record = data[product_name][-1]
-            latest_record['timestamp'] = datetime.fromisoformat(latest_record['timestamp'])
-            
-            return PriceRecord(**latest_record)
-            
+            return self._from_row(row)
+        
         except Exception as e:
             self.logger.error(f"Failed to get latest price for {product_name}: {e}")
             return None
@@ -70,66 +143,152 @@ class PriceStorage:
     def get_price_history(self, product_name: str, limit: int = 10) -> List[PriceRecord]:
         """Get price history for a product"""
         try:
-            data = self._load_data()
-            
-            if product_name not in data:
-                return []
-            
-            records = []
-            for record_dict in data[product_name][-limit:]:
-                record_dict['timestamp'] = datetime.fromisoformat(record_dict['timestamp'])
-                records.append(PriceRecord(**record_dict))
-            
-            return records
+            rows = self.conn.execute(
+                f"SELECT {', '.join(PRICE_COLUMNS)} FROM prices "
+                "WHERE product_name = ? ORDER BY id DESC LIMIT ?",
+                (product_name, limit)
+            ).fetchall()
             
+            # Oldest first, like the records were saved
+            return [self._from_row(row) for row in reversed(rows)]
+        
         except Exception as e:
             self.logger.error(f"Failed to get price history for {product_name}: {e}")
             return []
     
-    def get_all_products(self) -> List[str]:
-        """Get list of all monitored products"""
+    def get_http_validators(self) -> Dict[str, Dict[str, str]]:
+        """Get the ETag/Last-Modified validators saved by the last run"""
         try:
-            data = self._load_data()
-            return list(data.keys())
+            rows = self.conn.execute(
+                "SELECT product_name, url, price_selector, etag, last_modified FROM http_validators"
+            ).fetchall()
+            return {
+                row['product_name']: {
+                    'url': row['url'],
+                    'price_selector': row['price_selector'],
+                    'etag': row['etag'],
+                    'last_modified': row['last_modified'],
+                }
+                for row in rows
+            }
         except Exception as e:
-            self.logger.error(f"Failed to get product list: {e}")
-            return []
+            self.logger.error(f"Failed to load HTTP validators: {e}")
+            return {}
     
-    def _load_data(self) -> Dict:
-        """Load data from storage file"""
+    def save_http_validators(self, validators: Dict[str, Dict[str, str]]):
+        """Save ETag/Last-Modified validators for the next run"""
         try:
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
+            with self.conn:
+                self.conn.execute("DELETE FROM http_validators")
+                self.conn.executemany(
+                    "INSERT INTO http_validators (product_name, url, price_selector, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (product_name, v.get('url'), v.get('price_selector'), v.get('etag'), v.get('last_modified'))
+                        for product_name, v in validators.items()
+                    ]
+                )
         except Exception as e:
-            self.logger.error(f"Failed to load data: {e}")
-            return {}
+            self.logger.error(f"Failed to save HTTP validators: {e}")
+    
+    def get_selector_hints(self) -> Tuple[Dict[Tuple[str, str], str], Dict[str, str]]:
+        """Get the fallback selectors that last found prices, by (URL, product selector) and by host"""
+        try:
+            url_hints = {
+                (row['url'], row['price_selector']): row['selector']
+                for row in self.conn.execute("SELECT url, price_selector, selector FROM url_selector_hints")
+            }
+            host_hints = {
+                row['host']: row['selector']
+                for row in self.conn.execute("SELECT host, selector FROM host_selector_hints")
+            }
+            return url_hints, host_hints
+        except Exception as e:
+            self.logger.error(f"Failed to load selector hints: {e}")
+            return {}, {}
+    
+    def save_selector_hints(self, url_hints: Dict[Tuple[str, str], str], host_hints: Dict[str, str]):
+        """Save fallback selector hints for the next run"""
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM url_selector_hints")
+                self.conn.execute("DELETE FROM host_selector_hints")
+                self.conn.executemany(
+                    "INSERT INTO url_selector_hints (url, price_selector, selector) VALUES (?, ?, ?)",
+                    [(url, price_selector, selector) for (url, price_selector), selector in url_hints.items()]
+                )
+                self.conn.executemany(
+                    "INSERT INTO host_selector_hints (host, selector) VALUES (?, ?)",
+                    list(host_hints.items())
+                )
+        except Exception as e:
+            self.logger.error(f"Failed to save selector hints: {e}")
     
-    def _save_data(self, data: Dict):
-        """Save data to storage file"""
+    def get_all_products(self) -> List[str]:
+        """Get list of all monitored products"""
         try:
-            with open(self.storage_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            rows = self.conn.execute(
+                "SELECT product_name FROM prices GROUP BY product_name ORDER BY MIN(id)"
+            ).fetchall()
+            return [row['product_name'] for row in rows]
         except Exception as e:
-            self.logger.error(f"Failed to save data: {e}")
+            self.logger.error(f"Failed to get product list: {e}")
+            return []
+    
+    def _insert_rows(self, rows: List[tuple]):
+        """Insert price rows, the caller owns the transaction"""
+        self.conn.executemany(
+            f"INSERT INTO prices ({', '.join(PRICE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in PRICE_COLUMNS)})",
+            rows
+        )
+    
+    def _trim(self, product_name: str):
+        """Keep only the newest MAX_RECORDS_PER_PRODUCT records of a product"""
+        self.conn.execute(
+            "DELETE FROM prices WHERE product_name = ? AND id NOT IN ("
+            "SELECT id FROM prices WHERE product_name = ? ORDER BY id DESC LIMIT ?)",
+            (product_name, product_name, MAX_RECORDS_PER_PRODUCT)
+        )
+    
+    def _to_row(self, price_record: PriceRecord) -> tuple:
+        """Convert a price record into a prices table row"""
+        record_dict = price_record.model_dump()
+        record_dict['timestamp'] = price_record.timestamp.isoformat()
+        return tuple(record_dict[column] for column in PRICE_COLUMNS)
+    
+    def _from_row(self, row: sqlite3.Row) -> PriceRecord:
+        """Convert a prices table row into a price record"""
+        record_dict = dict(row)
+        record_dict['timestamp'] = datetime.fromisoformat(record_dict['timestamp'])
+        return PriceRecord(**record_dict)
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
     
     def export_to_csv(self, output_file: str = "price_history.csv"):
         """Export all price history to CSV"""
         try:
             import csv
             
-            data = self._load_data()
+            rows = self.conn.execute(
+                f"SELECT {', '.join(PRICE_COLUMNS)} FROM prices ORDER BY product_name, id"
+            ).fetchall()
             
             with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['product_name', 'current_price', 'previous_price', 
+                fieldnames = ['product_name', 'current_price', 'previous_price',
                              'timestamp', 'url', 'price_dropped', 'target_price_reached']
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 
                 writer.writeheader()
-                for product_name, records in data.items():
-                    for record in records:
-                        writer.writerow(record)
+                for row in rows:
+                    record = dict(row)
+                    record['price_dropped'] = bool(record['price_dropped'])
+                    record['target_price_reached'] = bool(record['target_price_reached'])
+                    writer.writerow(record)
             
             self.logger.info(f"Exported price history to {output_file}")
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to export to CSV: {e}")
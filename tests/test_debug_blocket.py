@@ -0,0 +1,32 @@
+import unittest
+
+from debug_blocket import KrScanner, _CHUNK_SIZE, _KR_CARRY_BYTES, _KR_CONTEXT_BYTES, _KR_PRICE_RE
+
+
+def _feed(data: bytes, chunk_size: int) -> KrScanner:
+    scanner = KrScanner()
+    for start in range(0, len(data), chunk_size):
+        scanner.feed(data[start:start + chunk_size])
+    scanner.feed(b'', final=True)
+    return scanner
+
+
+class KrScannerTest(unittest.TestCase):
+    """Chunked 'kr' scanning in debug_blocket.KrScanner"""
+    
+    def test_buffer_stays_bounded_without_matches(self):
+        scanner = KrScanner()
+        for _ in range(50):
+            scanner.feed(b'<div>no price here</div>' * (_CHUNK_SIZE // 24))
+            self.assertLessEqual(len(scanner._buffer), _KR_CARRY_BYTES + _KR_CONTEXT_BYTES)
+    
+    def test_matches_split_across_chunks(self):
+        data = b''.join(b'<span>%d %03d kr</span>\n<p>filler</p>' % (i, i) for i in range(1, 2000))
+        for chunk_size in (7, 100, 4096, _CHUNK_SIZE):
+            scanner = _feed(data, chunk_size)
+            self.assertEqual(scanner.count, len(_KR_PRICE_RE.findall(data)))
+            self.assertEqual(scanner.samples[0], '<span>1 001 kr</span>')
+
+
+if __name__ == '__main__':
+    unittest.main()
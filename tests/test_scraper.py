@@ -0,0 +1,49 @@
+import unittest
+
+from models import Product
+from scraper import PrisjaktScraper, ScrapedPage
+
+
+def _page(html: str) -> ScrapedPage:
+    return ScrapedPage(html.encode('utf-8'), html)
+
+
+class SelectorHintTest(unittest.TestCase):
+    """Selector hints remembered by PrisjaktScraper._find_price"""
+    
+    PAGE_A = '<html><body><p>Nu 3 499 kr</p></body></html>'
+    PAGE_B = (
+        '<html><body><div class="current-price">4 199 kr</div>'
+        '<p>Paketpris 24 999 kr</p></body></html>'
+    )
+    
+    def setUp(self):
+        self.scraper = PrisjaktScraper()
+        self.product_a = Product(name="A", url="https://www.prisjakt.nu/produkt.php?p=1")
+        self.product_b = Product(name="B", url="https://www.prisjakt.nu/produkt.php?p=2")
+    
+    def tearDown(self):
+        self.scraper.close()
+    
+    def test_text_search_is_not_a_host_hint(self):
+        self.assertEqual(self.scraper._find_price(_page(self.PAGE_A), self.product_a), 3499)
+        self.assertEqual(self.scraper._find_price(_page(self.PAGE_B), self.product_b), 4199)
+        self.assertNotIn("text_search_kr", self.scraper.host_hints.values())
+    
+    def test_text_search_is_kept_as_url_hint(self):
+        self.scraper._find_price(_page(self.PAGE_A), self.product_a)
+        key = (str(self.product_a.url), self.product_a.price_selector)
+        self.assertEqual(self.scraper.url_hints[key], "text_search_kr")
+    
+    def test_fallback_selector_becomes_host_hint(self):
+        self.scraper._find_price(_page(self.PAGE_B), self.product_b)
+        self.assertEqual(self.scraper.host_hints["www.prisjakt.nu"], ".current-price")
+    
+    def test_url_hints_are_kept_per_price_selector(self):
+        other = Product(name="B2", url=str(self.product_b.url), price_selector=".nothing")
+        self.scraper.url_hints[(str(self.product_b.url), other.price_selector)] = "text_search_kr"
+        self.assertEqual(self.scraper._find_price(_page(self.PAGE_B), self.product_b), 4199)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -42,6 +42,10 @@ else
     exit 1
 fi
 
+# Stop service for update, before the backup so the database is not written meanwhile
+echo "⏸️  Stopping $SERVICE_NAME service..."
+sudo systemctl stop "$SERVICE_NAME" 2>/dev/null || echo "   Service wasn't running"
+
 # Backup configuration and data
 echo "💾 Backing up configuration and data..."
 BACKUP_DIR="/tmp/price-tracker-backup-$(date +%Y%m%d-%H%M%S)"
@@ -51,13 +55,20 @@ mkdir -p "$BACKUP_DIR"
 sudo cp "$INSTALL_DIR/.env" "$BACKUP_DIR/" 2>/dev/null || echo "   No .env file to backup"
 sudo cp "$INSTALL_DIR/products.json" "$BACKUP_DIR/" 2>/dev/null || echo "   No products.json to backup"  
 sudo cp "$INSTALL_DIR/price_history.json" "$BACKUP_DIR/" 2>/dev/null || echo "   No price_history.json to backup"
+if [ -f "$INSTALL_DIR/price_history.db" ]; then
+    # The database runs in WAL mode, recent writes may still be in price_history.db-wal
+    if command -v sqlite3 >/dev/null 2>&1; then
+        sudo sqlite3 "$INSTALL_DIR/price_history.db" ".backup '$BACKUP_DIR/price_history.db'"
+    else
+        sudo cp "$INSTALL_DIR/price_history.db" "$BACKUP_DIR/"
+        sudo cp "$INSTALL_DIR/price_history.db-wal" "$BACKUP_DIR/" 2>/dev/null || true
+    fi
+else
+    echo "   No price_history.db to backup"
+fi
 
 echo "   Backup created at: $BACKUP_DIR"
 
-# Stop service for update
-echo "⏸️  Stopping $SERVICE_NAME service..."
-sudo systemctl stop "$SERVICE_NAME" 2>/dev/null || echo "   Service wasn't running"
-
 # If migrating from old installation, create new directory structure
 if [ "$INSTALL_DIR" = "$OLD_INSTALL" ]; then
     echo "🔄 Migrating from prisjakt-scraper to price-tracker..."
@@ -157,7 +168,19 @@ if [ -f "$BACKUP_DIR/price_history.json" ]; then
     sudo cp "$BACKUP_DIR/price_history.json" "$INSTALL_DIR/"
     echo "   ✅ Restored price_history.json"
 else
-    echo "   ℹ️  No price_history.json to restore (will be created on first run)"
+    echo "   ℹ️  No price_history.json to restore"
+fi
+
+if [ -f "$BACKUP_DIR/price_history.db" ]; then
+    sudo cp "$BACKUP_DIR/price_history.db" "$INSTALL_DIR/"
+    if [ -f "$BACKUP_DIR/price_history.db-wal" ]; then
+        sudo cp "$BACKUP_DIR/price_history.db-wal" "$INSTALL_DIR/"
+    else
+        sudo rm -f "$INSTALL_DIR/price_history.db-wal" "$INSTALL_DIR/price_history.db-shm"
+    fi
+    echo "   ✅ Restored price_history.db"
+else
+    echo "   ℹ️  No price_history.db to restore (will be created on first run)"
 fi
 
 # Fix permissions for all files